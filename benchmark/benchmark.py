@@ -0,0 +1,810 @@
+"""
+Benchmark the data structures in this repository against their standard
+library equivalents and emit the results as JSON.
+
+Each case times one core operation of a structure (e.g. HashTable insert)
+for a given input size and key distribution, and records the peak memory
+allocated while the operation runs. Before each size, the time needed to
+measure a case (including its untimed setup and memory run) is estimated
+from the sizes already measured, and that size and larger ones are skipped
+if the estimate exceeds the time budget. Sizes are also skipped after a
+case raises (e.g. RecursionError). Cases that could not be measured at any
+size are listed under "unmeasured".
+
+Usage:
+    python benchmark/benchmark.py --output before.json
+    python benchmark/benchmark.py --output after.json --compare before.json
+"""
+from __future__ import annotations
+import argparse
+import bisect
+import heapq
+import importlib.util
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+# HashTable._rehash deep-copies its chains recursively, so HashTable raises
+# RecursionError once roughly 190 keys collide; these sizes keep it measurable.
+COLLISION_SIZES = [50, 100, 150]
+DISTRIBUTIONS = ["random", "sorted", "collisions"]
+
+
+def load(directory: str, name: str) -> ModuleType:
+    """
+    Load a module from its file, since the directories in this repository
+    are not packages (and queue/queue.py would shadow the standard library).
+
+    Arguments:
+        directory: the directory containing the module.
+        name: the name of the module file (without .py).
+    """
+    spec = importlib.util.spec_from_file_location(
+        f"_benchmark_{name}", ROOT / directory / f"{name}.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+hash_table = load("hash-table", "hash_table")
+heap = load("heap", "heap")
+binary_search_tree = load("binary-search-tree", "binary_search_tree")
+linked_list = load("linked-list", "linked_list")
+queue = load("queue", "queue")
+stack = load("stack", "stack")
+
+
+def make_keys(distribution: str, size: int, seed: int) -> List[int]:
+    """
+    Return size distinct, truthy integer keys in the given distribution.
+
+    Arguments:
+        distribution: one of "random", "sorted" or "collisions".
+        size: the number of keys.
+        seed: the seed for the random number generator.
+    """
+    rng = random.Random(seed)
+    if distribution == "sorted":
+        return list(range(1, size + 1))
+    if distribution == "random":
+        keys = list(range(1, size + 1))
+    elif distribution == "collisions":
+        # hash(i << 32) == i << 32, so every key falls in the same bucket
+        # of any power-of-two sized table up to 2 ** 32 buckets.
+        keys = [i << 32 for i in range(1, size + 1)]
+    else:
+        raise ValueError(f"Unknown distribution: {distribution}")
+    rng.shuffle(keys)
+    return keys
+
+
+class Case(NamedTuple):
+    """
+    A single benchmarked operation.
+
+    Attributes:
+        structure: the name of the structure family (e.g. "hash_table").
+        implementation: the benchmarked class or standard library object.
+        operation: the name of the operation.
+        setup: builds the state the operation runs against (untimed).
+        run: performs the operation count times against the state.
+    """
+
+    structure: str
+    implementation: str
+    operation: str
+    setup: Callable[[List[int]], Any]
+    run: Callable[[Any, List[int], List[int]], Any]
+
+
+def _build_hash_table(keys: List[int]) -> Any:
+    """
+    Return a HashTable mapping each key to itself.
+
+    Arguments:
+        keys: the keys to build the structure from.
+    """
+    table = hash_table.HashTable()
+    for key in keys:
+        table[key] = key
+    return table
+
+
+def _build_dict(keys: List[int]) -> Dict[int, int]:
+    """
+    Return a dict mapping each key to itself.
+
+    Arguments:
+        keys: the keys to build the structure from.
+    """
+    return {key: key for key in keys}
+
+
+def _lookup(mapping: Any, keys: List[int], queries: List[int]) -> None:
+    """
+    Look up each query key in a mapping.
+
+    Arguments:
+        mapping: the HashTable or dict to look the keys up in.
+        keys: the keys the structure was built from.
+        queries: the keys to run the operation for.
+    """
+    for key in queries:
+        mapping[key]
+
+
+def _delete(mapping: Any, keys: List[int], queries: List[int]) -> None:
+    """
+    Delete each query key from a mapping.
+
+    Arguments:
+        mapping: the HashTable or dict to delete the keys from.
+        keys: the keys the structure was built from.
+        queries: the keys to run the operation for.
+    """
+    for key in queries:
+        del mapping[key]
+
+
+def _build_heap(keys: List[int]) -> Any:
+    """
+    Return a Heap built by adding the keys one at a time.
+
+    Arguments:
+        keys: the keys to build the structure from.
+    """
+    result = heap.Heap()
+    for key in keys:
+        result.add(key)
+    return result
+
+
+def _poll_heap(result: Any, keys: List[int], queries: List[int]) -> None:
+    """
+    Poll the Heap once per query.
+
+    Arguments:
+        result: the Heap to poll.
+        keys: the keys the structure was built from.
+        queries: the keys to run the operation for.
+    """
+    for _ in queries:
+        result.poll()
+
+
+def _build_heapq(keys: List[int]) -> List[int]:
+    """
+    Return a heapq list built by pushing the keys one at a time.
+
+    Arguments:
+        keys: the keys to build the structure from.
+    """
+    result = []
+    for key in keys:
+        heapq.heappush(result, key)
+    return result
+
+
+def _poll_heapq(result: List[int], keys: List[int], queries: List[int]) -> None:
+    """
+    Pop from the heapq list once per query.
+
+    Arguments:
+        result: the heapq list to pop from.
+        keys: the keys the structure was built from.
+        queries: the keys to run the operation for.
+    """
+    for _ in queries:
+        heapq.heappop(result)
+
+
+def _build_tree(keys: List[int]) -> Any:
+    """
+    Return a BinarySearchTree built by inserting the keys in order.
+
+    Arguments:
+        keys: the keys to build the structure from.
+    """
+    tree = binary_search_tree.BinarySearchTree()
+    for key in keys:
+        tree.insert(key)
+    return tree
+
+
+def _search_tree(tree: Any, keys: List[int], queries: List[int]) -> None:
+    """
+    Search the tree for each query key.
+
+    Arguments:
+        tree: the BinarySearchTree to search.
+        keys: the keys the structure was built from.
+        queries: the keys to run the operation for.
+    """
+    for key in queries:
+        tree.search(key)
+
+
+def _build_bisect(keys: List[int]) -> List[int]:
+    """
+    Return a sorted list built by insorting the keys one at a time.
+
+    Arguments:
+        keys: the keys to build the structure from.
+    """
+    result = []
+    for key in keys:
+        bisect.insort(result, key)
+    return result
+
+
+def _search_bisect(result: List[int], keys: List[int], queries: List[int]) -> None:
+    """
+    Binary search the sorted list for each query key.
+
+    Arguments:
+        result: the sorted list to search.
+        keys: the keys the structure was built from.
+        queries: the keys to run the operation for.
+    """
+    for key in queries:
+        bisect.bisect_left(result, key)
+
+
+def _build_linked_list(keys: List[int]) -> Any:
+    """
+    Return a LinkedList built by prepending the keys one at a time.
+
+    Arguments:
+        keys: the keys to build the structure from.
+    """
+    result = linked_list.LinkedList()
+    for key in keys:
+        result.prepend(key)
+    return result
+
+
+def _build_deque_left(keys: List[int]) -> deque:
+    """
+    Return a deque built by appending the keys on the left.
+
+    Arguments:
+        keys: the keys to build the structure from.
+    """
+    result = deque()
+    for key in keys:
+        result.appendleft(key)
+    return result
+
+
+def _index(result: Any, keys: List[int], queries: List[int]) -> None:
+    """
+    Index into a sequence once per query, at positions derived from the keys.
+
+    Arguments:
+        result: the LinkedList or deque to index.
+        keys: the keys the structure was built from.
+        queries: the keys to run the operation for.
+    """
+    size = len(keys)
+    for key in queries:
+        result[key % size]
+
+
+def _build_queue(keys: List[int]) -> Any:
+    """
+    Return a Queue built by enqueueing the keys one at a time.
+
+    Arguments:
+        keys: the keys to build the structure from.
+    """
+    result = queue.Queue()
+    for key in keys:
+        result.enqueue(key)
+    return result
+
+
+def _dequeue_queue(result: Any, keys: List[int], queries: List[int]) -> None:
+    """
+    Dequeue from the Queue once per query.
+
+    Arguments:
+        result: the Queue to dequeue from.
+        keys: the keys the structure was built from.
+        queries: the keys to run the operation for.
+    """
+    for _ in queries:
+        result.dequeue()
+
+
+def _build_deque(keys: List[int]) -> deque:
+    """
+    Return a deque built by appending the keys on the right.
+
+    Arguments:
+        keys: the keys to build the structure from.
+    """
+    result = deque()
+    for key in keys:
+        result.append(key)
+    return result
+
+
+def _dequeue_deque(result: deque, keys: List[int], queries: List[int]) -> None:
+    """
+    Pop from the left of the deque once per query.
+
+    Arguments:
+        result: the deque to pop from.
+        keys: the keys the structure was built from.
+        queries: the keys to run the operation for.
+    """
+    for _ in queries:
+        result.popleft()
+
+
+def _build_stack(keys: List[int]) -> Any:
+    """
+    Return a Stack built by pushing the keys one at a time.
+
+    Arguments:
+        keys: the keys to build the structure from.
+    """
+    result = stack.Stack()
+    for key in keys:
+        result.push(key)
+    return result
+
+
+def _build_list(keys: List[int]) -> List[int]:
+    """
+    Return a list built by appending the keys one at a time.
+
+    Arguments:
+        keys: the keys to build the structure from.
+    """
+    result = []
+    for key in keys:
+        result.append(key)
+    return result
+
+
+def _pop(result: Any, keys: List[int], queries: List[int]) -> None:
+    """
+    Pop from the stack once per query.
+
+    Arguments:
+        result: the Stack or list to pop from.
+        keys: the keys the structure was built from.
+        queries: the keys to run the operation for.
+    """
+    for _ in queries:
+        result.pop()
+
+
+def _nothing(keys: List[int]) -> None:
+    """
+    Return None, for cases whose operation builds its own structure.
+
+    Arguments:
+        keys: the keys (unused).
+    """
+    return None
+
+
+def _builder(build: Callable[[List[int]], Any]) -> Callable[..., Any]:
+    """
+    Wrap a build function so it can be used as the run of a Case.
+
+    Arguments:
+        build: the function that builds a structure from keys.
+    """
+
+    def run(state: Any, keys: List[int], queries: List[int]) -> Any:
+        """
+        Build the structure and return it, so that it is kept alive while
+        peak memory is measured.
+
+        Arguments:
+            state: the unused state returned by _nothing.
+            keys: the keys to build the structure from.
+            queries: the query keys (unused).
+        """
+        return build(keys)
+
+    return run
+
+
+CASES = [
+    Case("hash_table", "HashTable", "insert", _nothing, _builder(_build_hash_table)),
+    Case("hash_table", "HashTable", "lookup", _build_hash_table, _lookup),
+    Case("hash_table", "HashTable", "delete", _build_hash_table, _delete),
+    Case("hash_table", "dict", "insert", _nothing, _builder(_build_dict)),
+    Case("hash_table", "dict", "lookup", _build_dict, _lookup),
+    Case("hash_table", "dict", "delete", _build_dict, _delete),
+    Case("heap", "Heap", "add", _nothing, _builder(_build_heap)),
+    Case("heap", "Heap", "poll", _build_heap, _poll_heap),
+    Case("heap", "heapq", "add", _nothing, _builder(_build_heapq)),
+    Case("heap", "heapq", "poll", _build_heapq, _poll_heapq),
+    Case(
+        "binary_search_tree",
+        "BinarySearchTree",
+        "insert",
+        _nothing,
+        _builder(_build_tree),
+    ),
+    Case("binary_search_tree", "BinarySearchTree", "search", _build_tree, _search_tree),
+    Case("binary_search_tree", "bisect", "insert", _nothing, _builder(_build_bisect)),
+    Case("binary_search_tree", "bisect", "search", _build_bisect, _search_bisect),
+    Case(
+        "linked_list",
+        "LinkedList",
+        "prepend",
+        _nothing,
+        _builder(_build_linked_list),
+    ),
+    Case("linked_list", "LinkedList", "index", _build_linked_list, _index),
+    Case("linked_list", "deque", "prepend", _nothing, _builder(_build_deque_left)),
+    Case("linked_list", "deque", "index", _build_deque_left, _index),
+    Case("queue", "Queue", "enqueue", _nothing, _builder(_build_queue)),
+    Case("queue", "Queue", "dequeue", _build_queue, _dequeue_queue),
+    Case("queue", "deque", "enqueue", _nothing, _builder(_build_deque)),
+    Case("queue", "deque", "dequeue", _build_deque, _dequeue_deque),
+    Case("stack", "Stack", "push", _nothing, _builder(_build_stack)),
+    Case("stack", "Stack", "pop", _build_stack, _pop),
+    Case("stack", "list", "push", _nothing, _builder(_build_list)),
+    Case("stack", "list", "pop", _build_list, _pop),
+]
+
+
+def measure(
+    case: Case,
+    keys: List[int],
+    queries: List[int],
+    repeat: int,
+    memory: bool,
+) -> Dict[str, Any]:
+    """
+    Time a case (best of repeat runs) and measure its peak memory.
+
+    Arguments:
+        case: the case to measure.
+        keys: the keys the structure is built from.
+        queries: the keys used by operations on a built structure.
+        repeat: the number of timed runs.
+        memory: whether to measure peak memory with tracemalloc.
+    """
+    count = len(queries) if case.setup is not _nothing else len(keys)
+    best = float("inf")
+    for _ in range(repeat):
+        state = case.setup(keys)
+        start = time.perf_counter()
+        case.run(state, keys, queries)
+        best = min(best, time.perf_counter() - start)
+        del state
+
+    result = {"count": count, "seconds": best, "per_op": best / count}
+    if memory:
+        state = case.setup(keys)
+        tracemalloc.start()
+        # Keep the result alive so that built structures count towards the peak.
+        output = case.run(state, keys, queries)
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del output, state
+    return result
+
+
+def git_commit() -> Optional[str]:
+    """Return the current git commit of the repository, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def estimate_seconds(history: List[Tuple[int, float]], size: int) -> float:
+    """
+    Estimate how long measuring a case at a size will take, assuming the
+    time grows as a power of the size fitted to the last two measured sizes
+    (clamped between linear and quadratic; linear after one size).
+
+    Arguments:
+        history: the (size, seconds) measurements of the case so far.
+        size: the size to estimate the time for.
+    """
+    last_size, last_seconds = history[-1]
+    exponent = 1.0
+    if len(history) > 1:
+        previous_size, previous_seconds = history[-2]
+        exponent = math.log(last_seconds / previous_seconds) / math.log(
+            last_size / previous_size
+        )
+        exponent = min(max(exponent, 1.0), 2.0)
+    return last_seconds * (size / last_size) ** exponent
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run every selected case over every size and distribution.
+
+    Arguments:
+        args: the parsed command line arguments.
+    """
+    cases = [
+        case
+        for case in CASES
+        if not args.structures or case.structure in args.structures
+    ]
+    results = []
+    unmeasured = []
+    for distribution in args.distributions:
+        if args.sizes:
+            sizes = sorted(args.sizes)
+        elif distribution == "collisions":
+            sizes = COLLISION_SIZES + SIZES
+        else:
+            sizes = SIZES
+        abandoned = set()
+        history = {}
+        for size in sizes:
+            keys = make_keys(distribution, size, args.seed)
+            rng = random.Random(args.seed + 1)
+            queries = rng.sample(keys, min(size, args.queries))
+            for case in cases:
+                name = (case.structure, case.implementation, case.operation)
+                record = {
+                    "structure": case.structure,
+                    "implementation": case.implementation,
+                    "operation": case.operation,
+                    "distribution": distribution,
+                    "size": size,
+                }
+                if name in history and name not in abandoned:
+                    estimate = estimate_seconds(history[name], size)
+                    if estimate > args.budget:
+                        record["estimated_seconds"] = estimate
+                        abandoned.add(name)
+                if name in abandoned:
+                    record["skipped"] = True
+                    results.append(record)
+                    if "estimated_seconds" in record:
+                        print(format_record(record), file=sys.stderr)
+                    continue
+                start = time.perf_counter()
+                try:
+                    record.update(
+                        measure(case, keys, queries, args.repeat, args.memory)
+                    )
+                except Exception as error:
+                    record["error"] = f"{error.__class__.__name__}: {error}"
+                    abandoned.add(name)
+                else:
+                    elapsed = time.perf_counter() - start
+                    history.setdefault(name, []).append((size, elapsed))
+                results.append(record)
+                print(format_record(record), file=sys.stderr)
+
+        for case in cases:
+            name = (case.structure, case.implementation, case.operation)
+            if name not in history:
+                unmeasured.append(
+                    {
+                        "structure": case.structure,
+                        "implementation": case.implementation,
+                        "operation": case.operation,
+                        "distribution": distribution,
+                    }
+                )
+                print(
+                    f"{case.implementation}.{case.operation} [{distribution}]: "
+                    "could not be measured at any size",
+                    file=sys.stderr,
+                )
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "queries": args.queries,
+        },
+        "results": results,
+        "unmeasured": unmeasured,
+    }
+
+
+def format_record(record: Dict[str, Any]) -> str:
+    """
+    Return a one-line, human readable summary of a result record.
+
+    Arguments:
+        record: the result record to summarise.
+    """
+    name = (
+        f"{record['implementation']}.{record['operation']} "
+        f"[{record['distribution']}, n={record['size']}]"
+    )
+    if "error" in record:
+        return f"{name}: {record['error']}"
+    if "estimated_seconds" in record:
+        return f"{name}: skipped (estimated {record['estimated_seconds']:.0f} s)"
+    if record.get("skipped"):
+        return f"{name}: skipped"
+    summary = f"{name}: {record['per_op'] * 1e9:.1f} ns/op"
+    if "peak_bytes" in record:
+        summary += f", peak {record['peak_bytes'] / 2**20:.2f} MiB"
+    return summary
+
+
+def record_key(record: Dict[str, Any]) -> Tuple[str, str, str, int]:
+    """
+    Return the key identifying the case and size of a result record.
+
+    Arguments:
+        record: the result record.
+    """
+    return (
+        record["implementation"],
+        record["operation"],
+        record["distribution"],
+        record["size"],
+    )
+
+
+def record_status(record: Optional[Dict[str, Any]]) -> str:
+    """
+    Return whether a result record was measured, raised, was skipped or is
+    absent from a run.
+
+    Arguments:
+        record: the result record, or None if the run has no such record.
+    """
+    if record is None:
+        return "absent"
+    if "error" in record:
+        return "error"
+    if record.get("skipped"):
+        return "skipped"
+    return "measured"
+
+
+def ratio(new: float, old: float) -> str:
+    """
+    Return the ratio of two measurements, formatted for display.
+
+    Arguments:
+        new: the new measurement.
+        old: the baseline measurement.
+    """
+    if old == 0:
+        return "1.00x" if new == 0 else "inf"
+    return f"{new / old:.2f}x"
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """
+    Return lines comparing two benchmark runs: the time and peak memory
+    ratios of cases measured in both, and any change in a case's status
+    (e.g. measured in the baseline but raising or skipped in the new run).
+
+    Arguments:
+        old: the baseline results.
+        new: the results to compare against the baseline.
+    """
+    baseline = {record_key(record): record for record in old["results"]}
+    current = {record_key(record): record for record in new["results"]}
+    lines = []
+    for key in list(baseline) + [key for key in current if key not in baseline]:
+        previous, record = baseline.get(key), current.get(key)
+        implementation, operation, distribution, size = key
+        name = f"{implementation}.{operation} [{distribution}, n={size}]"
+        before, after = record_status(previous), record_status(record)
+        if before != after:
+            change = f"{name}: {before} -> {after}"
+            if after == "error":
+                change += f" ({record['error']})"
+            lines.append(change)
+        elif after == "measured":
+            change = f"{name}: time {ratio(record['per_op'], previous['per_op'])}"
+            if "peak_bytes" in record and "peak_bytes" in previous:
+                memory = ratio(record["peak_bytes"], previous["peak_bytes"])
+                change += f", memory {memory}"
+            lines.append(change)
+    return lines
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+
+    Arguments:
+        argv: the arguments to parse (defaults to sys.argv).
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        help="input sizes (default: 1e3 to 1e7, plus 50 to 150 for collisions)",
+    )
+    parser.add_argument(
+        "--distributions", nargs="+", choices=DISTRIBUTIONS, default=DISTRIBUTIONS
+    )
+    parser.add_argument(
+        "--structures",
+        nargs="+",
+        choices=sorted({case.structure for case in CASES}),
+        help="only benchmark these structures (default: all)",
+    )
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=10_000,
+        help="the number of operations run against a built structure",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=10.0,
+        help="skip sizes of a case estimated to take longer than this to measure",
+    )
+    parser.add_argument(
+        "--no-memory", dest="memory", action="store_false", help="skip tracemalloc"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    parser.add_argument("--compare", type=Path, help="baseline JSON results")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Run the benchmarks and write or print the results, comparing them
+    against a baseline if one is given.
+
+    Arguments:
+        argv: the command line arguments (defaults to sys.argv).
+    """
+    args = parse_args(argv)
+    results = run_benchmarks(args)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    else:
+        print(json.dumps(results, indent=2))
+    if args.compare:
+        old = json.loads(args.compare.read_text())
+        print("\n".join(compare(old, results)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
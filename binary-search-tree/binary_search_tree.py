@@ -1,7 +1,48 @@
 from __future__ import annotations
+import gc
+import pickle
+import struct
 from typing import Any
+from typing import BinaryIO
+from typing import Dict
+from typing import Generator
+from typing import Iterator
 from typing import Optional
 from typing import Union
+from collections import Counter
+from functools import partial
+from itertools import chain
+from itertools import islice
+from sys import getsizeof
+from types import BuiltinFunctionType
+from types import FunctionType
+from types import ModuleType
+
+
+_SHARED = (type, ModuleType, FunctionType, BuiltinFunctionType)
+
+
+def _deep_sizeof(root: Any) -> int:
+    """
+    Return the number of bytes used by an object and every object it
+    references, counting each object once. Classes, modules and functions
+    are shared with the rest of the program, so they are not counted.
+
+    Arguments:
+        root: the object to measure.
+    """
+    seen = set()
+    objects = [root]
+    total = 0
+    # Walk the references iteratively to avoid recursion limits.
+    while objects:
+        obj = objects.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED):
+            continue
+        seen.add(id(obj))
+        total += getsizeof(obj)
+        objects.extend(gc.get_referents(obj))
+    return total
 
 
 class Node:
@@ -12,12 +53,15 @@ class Node:
         key: the key stored in the node.
         left: the left child of the node.
         right: the right child of the node.
+        parent: the parent of the node.
 
     Methods:
         __init__
         __repr__
     """
 
+    __slots__ = ("key", "left", "right", "parent")
+
     def __init__(
         self,
         key: Any,
@@ -50,16 +94,35 @@ class BinarySearchTree:
 
     Attributes:
         root: the root node in the binary search tree.
+        _stats: recorded instrumentation, or None if it is disabled.
+        _filter: a membership filter consulted before searches, or None.
 
     Methods:
         __init__
         insert
         _insert
+        search
+        _search
+        delete
+        attach_filter
+        detach_filter
+        memory_footprint
+        dump
+        load
+        _build
+        _in_order
+        enable_stats
+        disable_stats
+        stats
+        _successor
+        _minimum
     """
 
     def __init__(self) -> None:
         """Initialise the binary search tree with no nodes."""
         self.root = None
+        self._stats = None
+        self._filter = None
 
     def insert(self, key: Any) -> None:
         """
@@ -72,9 +135,15 @@ class BinarySearchTree:
             key: the key to insert.
         """
         self.root = self._insert(key, None, self.root)
+        if self._filter is not None:
+            self._filter.add(key)
 
     def _insert(
-        self, key: Any, parent: Union[Node, None], cursor: Union[Node, None]
+        self,
+        key: Any,
+        parent: Union[Node, None],
+        cursor: Union[Node, None],
+        depth: int = 0,
     ) -> Node:
         """
         Private insert method -- used by self.insert to insert nodes.
@@ -82,16 +151,20 @@ class BinarySearchTree:
         Arguments:
             key: the key to insert.
             cursor: the node to consider as the root for recursive insertion.
+            depth: the depth of cursor in the tree.
         """
         if cursor is None:
+            if self._stats is not None:
+                self._stats["insert_depths"][depth] += 1
             return Node(key, parent=parent)
         else:
             if key == cursor.key:
-                pass
+                if self._stats is not None:
+                    self._stats["insert_depths"][depth] += 1
             elif key < cursor.key:
-                cursor.left = self._insert(key, cursor, cursor.left)
+                cursor.left = self._insert(key, cursor, cursor.left, depth + 1)
             else:
-                cursor.right = self._insert(key, cursor, cursor.right)
+                cursor.right = self._insert(key, cursor, cursor.right, depth + 1)
         return cursor
 
     def search(self, key: Any) -> Any:
@@ -103,9 +176,16 @@ class BinarySearchTree:
         Arguments:
             key: the key to search the tree for.
         """
+        if self._filter is not None:
+            if key not in self._filter:
+                return None
+            result = self._search(key, self.root)
+            if self._stats is not None and result is None:
+                self._stats["filter_false_positives"] += 1
+            return result
         return self._search(key, self.root)
 
-    def _search(self, key: Any, cursor: Union[Node, None]) -> Any:
+    def _search(self, key: Any, cursor: Union[Node, None], depth: int = 0) -> Any:
         """
         Private search method -- recursively searches the tree starting
         at a given node.
@@ -113,18 +193,148 @@ class BinarySearchTree:
         Arguments:
             key: the key to search the tree for
             cursor: the node to consider as the root for recursive search.
+            depth: the depth of cursor in the tree.
         """
         if not cursor or cursor.key == key:
+            if self._stats is not None:
+                self._stats["search_depths"][depth] += 1
             return cursor
 
         if key < cursor.key:
-            return self._search(key, cursor.left)
+            return self._search(key, cursor.left, depth + 1)
         else:
-            return self._search(key, cursor.right)
+            return self._search(key, cursor.right, depth + 1)
 
     def delete(self, key: Any) -> None:
         pass
 
+    def attach_filter(self, filter: Any) -> None:
+        """
+        Attach a membership filter (e.g. a BloomFilter) that is consulted
+        before each search, so that most searches for missing keys do not
+        descend the tree. The filter must never report false negatives, and
+        the keys must be hashable. It is rebuilt from the stored keys now.
+
+        Arguments:
+            filter: an object with add, clear, __contains__ and
+                memory_footprint methods, sized for the expected keys.
+        """
+        self._filter = filter
+        self._filter.clear()
+        for node in self._in_order():
+            self._filter.add(node.key)
+
+    def detach_filter(self) -> None:
+        """Stop consulting the attached membership filter."""
+        self._filter = None
+
+    def memory_footprint(self) -> int:
+        """
+        Return the number of bytes used by the tree, its nodes and the keys
+        stored in them, following references from the keys (and any attached
+        filter).
+        """
+        return _deep_sizeof(self)
+
+    def dump(self, file: BinaryIO, chunk_size: int = 65536) -> None:
+        """
+        Write the tree to a binary file object: a header holding the
+        number of keys, followed by the keys in order as pickled lists of
+        at most chunk_size keys.
+
+        Arguments:
+            file: the binary file object to write to.
+            chunk_size: the maximum number of keys per pickled list.
+        """
+        count = sum(1 for _ in self._in_order())
+        file.write(struct.pack("<4sQ", b"BST ", count))
+        items = iter((node.key for node in self._in_order()))
+        for chunk in iter(lambda: list(islice(items, chunk_size)), []):
+            pickle.dump(chunk, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, file: BinaryIO) -> BinarySearchTree:
+        """
+        Construct a tree from a trusted binary file object written by dump.
+        The keys are linked into a balanced tree in a single pass, without
+        comparisons, so the loaded tree may have a different shape to the
+        dumped tree.
+
+        Arguments:
+            file: the binary file object to read from.
+        """
+        magic, count = struct.unpack("<4sQ", file.read(12))
+        if magic != b"BST ":
+            raise ValueError("Not a binary search tree dump")
+        tree = cls()
+        chunks = iter(partial(pickle.load, file), None)
+        items = islice(chain.from_iterable(chunks), count)
+        tree.root = tree._build(items, count, None)
+        return tree
+
+    def _build(
+        self, keys: Iterator[Any], count: int, parent: Union[Node, None]
+    ) -> Union[Node, None]:
+        """
+        Build a balanced tree from the next count keys of an in-order
+        iterator and return its root. The recursion depth is logarithmic.
+
+        Arguments:
+            keys: an iterator of keys in order.
+            count: the number of keys to build the tree from.
+            parent: the parent of the root of the tree.
+        """
+        if count == 0:
+            return None
+        left_count = (count - 1) // 2
+        node = Node(None, parent=parent)
+        node.left = self._build(keys, left_count, node)
+        node.key = next(keys)
+        node.right = self._build(keys, count - left_count - 1, node)
+        return node
+
+    def _in_order(self) -> Generator[Node, None, None]:
+        """Return a generator for the nodes of the tree, in key order."""
+        # Walk the tree iteratively to avoid recursion limits on deep trees.
+        cursors = []
+        cursor = self.root
+        while cursors or cursor:
+            while cursor:
+                cursors.append(cursor)
+                cursor = cursor.left
+            cursor = cursors.pop()
+            yield cursor
+            cursor = cursor.right
+
+    def enable_stats(self) -> None:
+        """
+        Start recording instrumentation (discarding anything recorded before):
+        histograms of the depth at which each search and insert terminated,
+        and the number of searches that passed the membership filter but
+        missed.
+        """
+        self._stats = {
+            "search_depths": Counter(),
+            "insert_depths": Counter(),
+            "filter_false_positives": 0,
+        }
+
+    def disable_stats(self) -> None:
+        """Stop recording instrumentation and discard anything recorded."""
+        self._stats = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the recorded instrumentation as a plain dict, with histograms
+        as dicts mapping a depth to the number of times it was recorded.
+        """
+        if self._stats is None:
+            raise RuntimeError("Instrumentation is not enabled")
+        return {
+            name: dict(value) if isinstance(value, Counter) else value
+            for name, value in self._stats.items()
+        }
+
     def _successor(self, cursor: Node) -> Node:
         """
         Returns the node in the tree with the smallest key that is
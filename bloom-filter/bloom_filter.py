@@ -0,0 +1,163 @@
+from __future__ import annotations
+from typing import Any
+from typing import Dict
+from typing import Generator
+from typing import Optional
+from math import ceil
+from math import exp
+from math import log
+from sys import getsizeof
+
+
+_MASK = 2**64 - 1
+
+
+def _mix(value: int) -> int:
+    """
+    Return a well-distributed 64-bit integer derived from value (the
+    splitmix64 finaliser), since hash() of small integers is the integer.
+
+    Arguments:
+        value: the integer to mix.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+class BloomFilter:
+    """
+    An implementation of a bit-array-backed Bloom filter: a probabilistic
+    set of hashable keys that may report false positives, but never false
+    negatives.
+
+    The filter is sized for a number of keys (capacity) and a target false
+    positive rate, optionally capped by a memory budget. Adding more keys
+    than the capacity (or capping the memory) raises the false positive
+    rate, which is reported by false_positive_rate.
+
+    Attributes:
+        _bits: the bit array.
+        _size: the number of bits in the bit array.
+        _hashes: the number of bits set for each key.
+        _count: the number of keys added since the filter was cleared.
+        _queries: the number of membership tests made.
+        _rejections: the number of membership tests that returned False.
+
+    Methods:
+        __init__
+        __repr__
+        __len__
+        __contains__
+        add
+        clear
+        false_positive_rate
+        memory_footprint
+        stats
+        _indexes
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        false_positive_rate: float = 0.01,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        """
+        Initialise an empty filter.
+
+        Arguments:
+            capacity: the number of keys the filter is sized for.
+            false_positive_rate: the target false positive rate at capacity.
+            max_bytes: the maximum size of the bit array in bytes (optional).
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be positive")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("False positive rate must be between 0 and 1")
+        size = ceil(-capacity * log(false_positive_rate) / log(2) ** 2)
+        if max_bytes is not None:
+            size = min(size, max_bytes * 8)
+        self._size = max(size, 8)
+        self._hashes = max(1, round(self._size / capacity * log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self._count = 0
+        self._queries = 0
+        self._rejections = 0
+
+    def __repr__(self) -> str:
+        """Return a string representation of the filter."""
+        return (
+            f"{self.__class__.__name__}(bits={self._size}, "
+            f"hashes={self._hashes}, count={self._count})"
+        )
+
+    def __len__(self) -> int:
+        """Return the number of keys added since the filter was cleared."""
+        return self._count
+
+    def __contains__(self, key: Any) -> bool:
+        """
+        Return False if the key has definitely not been added to the filter,
+        and True if it probably has.
+
+        Arguments:
+            key: the key to test.
+        """
+        self._queries += 1
+        bits = self._bits
+        for index in self._indexes(key):
+            if not bits[index >> 3] & (1 << (index & 7)):
+                self._rejections += 1
+                return False
+        return True
+
+    def add(self, key: Any) -> None:
+        """
+        Add a key to the filter.
+
+        Arguments:
+            key: the (hashable) key to add.
+        """
+        bits = self._bits
+        for index in self._indexes(key):
+            bits[index >> 3] |= 1 << (index & 7)
+        self._count += 1
+
+    def clear(self) -> None:
+        """Remove all keys from the filter (keeping its size)."""
+        self._bits = bytearray(len(self._bits))
+        self._count = 0
+
+    def false_positive_rate(self) -> float:
+        """Return the estimated false positive rate for the keys added."""
+        return (1 - exp(-self._hashes * self._count / self._size)) ** self._hashes
+
+    def memory_footprint(self) -> int:
+        """Return the approximate number of bytes used by the filter."""
+        return getsizeof(self) + getsizeof(self.__dict__) + getsizeof(self._bits)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the configuration and usage of the filter as a plain dict."""
+        return {
+            "bits": self._size,
+            "hashes": self._hashes,
+            "count": self._count,
+            "false_positive_rate": self.false_positive_rate(),
+            "queries": self._queries,
+            "rejections": self._rejections,
+        }
+
+    def _indexes(self, key: Any) -> Generator[int, None, None]:
+        """
+        Return a generator for the indexes of the bits for a key, using
+        double hashing of a single 64-bit hash.
+
+        Arguments:
+            key: the key to find the bit indexes of.
+        """
+        value = _mix(hash(key) & _MASK)
+        first, second = value & 0xFFFFFFFF, (value >> 32) | 1
+        for i in range(self._hashes):
+            yield (first + i * second) % self._size
@@ -1,8 +1,48 @@
 from __future__ import annotations
+import gc
+import pickle
+import struct
 from typing import Any
+from typing import BinaryIO
 from typing import Optional
+from typing import Dict
 from typing import Generator
+from collections import Counter
 from copy import deepcopy
+from functools import partial
+from itertools import chain
+from itertools import islice
+from sys import getsizeof
+from time import perf_counter
+from types import BuiltinFunctionType
+from types import FunctionType
+from types import ModuleType
+
+
+_SHARED = (type, ModuleType, FunctionType, BuiltinFunctionType)
+
+
+def _deep_sizeof(root: Any) -> int:
+    """
+    Return the number of bytes used by an object and every object it
+    references, counting each object once. Classes, modules and functions
+    are shared with the rest of the program, so they are not counted.
+
+    Arguments:
+        root: the object to measure.
+    """
+    seen = set()
+    objects = [root]
+    total = 0
+    # Walk the references iteratively to avoid recursion limits.
+    while objects:
+        obj = objects.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED):
+            continue
+        seen.add(id(obj))
+        total += getsizeof(obj)
+        objects.extend(gc.get_referents(obj))
+    return total
 
 
 class Node:
@@ -19,6 +59,8 @@ class Node:
         __repr__
     """
 
+    __slots__ = ("key", "data", "next")
+
     def __init__(
         self,
         key: Optional[Any] = None,
@@ -50,12 +92,26 @@ class HashTable:
     Attributes:
         _load: the number of stored key, data pairs in the hash map.
         _array: a list storing the head node of a linked list.
+        _stats: recorded instrumentation, or None if it is disabled.
+        _filter: a membership filter consulted before lookups, or None.
+        _filter_deletions: the number of deletions since _filter was rebuilt.
 
     Methods:
         __init__
         __getitem__
+        get
+        _find
         __setitem__
         __delitem__
+        attach_filter
+        detach_filter
+        _rebuild_filter
+        memory_footprint
+        dump
+        load
+        enable_stats
+        disable_stats
+        stats
         _rehash_needed
         _rehash
     """
@@ -64,6 +120,9 @@ class HashTable:
         """Initialise an empty hash map."""
         self._load = 0
         self._array = [Node() for _ in range(16)]
+        self._stats = None
+        self._filter = None
+        self._filter_deletions = 0
 
     def __getitem__(self, key: Any) -> Any:
         """
@@ -72,15 +131,52 @@ class HashTable:
         Arguments:
             key: the key used to store the data.
         """
-        key_hash = hash(key) % len(self._array)
-        cursor = self._array[key_hash]
-        while cursor and cursor.key != key:
-            cursor = cursor.next
+        cursor = self._find(key)
         if cursor:
             return cursor.data
         else:
             raise KeyError(f"{key}")
 
+    def get(self, key: Any, default: Optional[Any] = None) -> Any:
+        """
+        Return the data associated with the given key, or a default if the
+        key is not in the hash table.
+
+        Arguments:
+            key: the key used to store the data.
+            default: the value to return if the key is not found.
+        """
+        cursor = self._find(key)
+        if cursor:
+            return cursor.data
+        else:
+            return default
+
+    def _find(self, key: Any) -> Optional[Node]:
+        """
+        Return the node storing the given key, or None if there is none.
+        If a filter is attached, it is consulted before walking the chain.
+
+        Arguments:
+            key: the key to find.
+        """
+        if self._filter is not None and key not in self._filter:
+            return None
+        key_hash = hash(key) % len(self._array)
+        cursor = self._array[key_hash]
+        if self._stats is None:
+            while cursor and cursor.key != key:
+                cursor = cursor.next
+        else:
+            probes = 1
+            while cursor and cursor.key != key:
+                cursor = cursor.next
+                probes += 1
+            self._stats["lookup_probes"][probes] += 1
+            if self._filter is not None and not cursor:
+                self._stats["filter_false_positives"] += 1
+        return cursor
+
     def __setitem__(self, key: Any, value: Any) -> None:
         """
         Insert a key and associated data into the hash table.
@@ -93,12 +189,21 @@ class HashTable:
             raise TypeError("Invalid key")
         key_hash = hash(key) % len(self._array)
         cursor = self._array[key_hash]
-        while cursor.key and cursor.next:
-            cursor = cursor.next
+        if self._stats is None:
+            while cursor.key and cursor.next:
+                cursor = cursor.next
+        else:
+            probes = 1
+            while cursor.key and cursor.next:
+                cursor = cursor.next
+                probes += 1
+            self._stats["insert_probes"][probes] += 1
         if cursor.key:
             cursor.next = Node(key, value, None)
         else:
             cursor.key, cursor.data = key, value
+        if self._filter is not None:
+            self._filter.add(key)
         self._load += 1
         if self._rehash_needed():
             self._rehash()
@@ -116,6 +221,8 @@ class HashTable:
         while cursor and cursor.key != key:
             prev, cursor = cursor, cursor.next
             index += 1
+        if self._stats is not None:
+            self._stats["delete_probes"][index + 1] += 1
         if cursor:
             if index == 0:
                 self._array[key_hash] = (
@@ -123,9 +230,146 @@ class HashTable:
                 )
             else:
                 prev.next = cursor.next if cursor else None
+            if self._filter is not None:
+                # A deleted key leaves stale bits, which only cause false
+                # positives, so the filter is rebuilt lazily.
+                self._filter_deletions += 1
+                if 4 * self._filter_deletions >= len(self._filter):
+                    self._rebuild_filter()
         else:
             raise KeyError(f"{key}")
 
+    def attach_filter(self, filter: Any) -> None:
+        """
+        Attach a membership filter (e.g. a BloomFilter) that is consulted
+        before each lookup, so that most lookups of missing keys do not walk
+        a chain. The filter must never report false negatives. It is rebuilt
+        from the stored keys now, on every rehash, and once the deletions
+        since it was last rebuilt reach a quarter of its keys.
+
+        Arguments:
+            filter: an object with add, clear, __len__, __contains__ and
+                memory_footprint methods, sized for the expected keys.
+        """
+        self._filter = filter
+        self._rebuild_filter()
+
+    def detach_filter(self) -> None:
+        """Stop consulting the attached membership filter."""
+        self._filter = None
+
+    def _rebuild_filter(self) -> None:
+        """Clear the membership filter and add every stored key to it."""
+        self._filter.clear()
+        for head in self._array:
+            for cursor in self._chain(head):
+                self._filter.add(cursor.key)
+        self._filter_deletions = 0
+
+    def memory_footprint(self) -> int:
+        """
+        Return the number of bytes used by the hash table, its chains and the
+        keys and data stored in them, following references from the data (and
+        any attached filter).
+        """
+        return _deep_sizeof(self)
+
+    def dump(self, file: BinaryIO, chunk_size: int = 65536) -> None:
+        """
+        Write the hash table to a binary file object: a header holding the
+        number of entries and the size of the array, followed by the
+        (key, data) entries in bucket order as pickled lists of at most
+        chunk_size entries.
+
+        Arguments:
+            file: the binary file object to write to.
+            chunk_size: the maximum number of entries per pickled list.
+        """
+        count = sum(1 for head in self._array for _ in self._chain(head))
+        file.write(struct.pack("<4sQQ", b"HTBL", count, len(self._array)))
+        entries = (
+            (cursor.key, cursor.data)
+            for head in self._array
+            for cursor in self._chain(head)
+        )
+        items = iter(entries)
+        for chunk in iter(lambda: list(islice(items, chunk_size)), []):
+            pickle.dump(chunk, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, file: BinaryIO) -> HashTable:
+        """
+        Construct a hash table from a trusted binary file object written by
+        dump. The array is allocated at its dumped size, so no rehashing is
+        done, and each entry is appended to the tail of its chain in O(1).
+
+        Arguments:
+            file: the binary file object to read from.
+        """
+        magic, count, size = struct.unpack("<4sQQ", file.read(20))
+        if magic != b"HTBL":
+            raise ValueError("Not a hash table dump")
+        table = cls()
+        table._array = [Node() for _ in range(size)]
+        tails = table._array[:]
+        chunks = iter(partial(pickle.load, file), None)
+        items = islice(chain.from_iterable(chunks), count)
+        for key, data in items:
+            # Bucket indexes are recomputed, since hashes of e.g. strings
+            # differ between interpreter processes.
+            key_hash = hash(key) % size
+            tail = tails[key_hash]
+            if tail.key:
+                tail.next = tails[key_hash] = Node(key, data, None)
+            else:
+                tail.key, tail.data = key, data
+        table._load = count
+        return table
+
+    def _chain(self, head: Node) -> Generator[Node, None, None]:
+        """
+        Return a generator for the nodes storing entries in a chain.
+
+        Arguments:
+            head: the head node of the chain.
+        """
+        cursor = head
+        while cursor and cursor.key:
+            yield cursor
+            cursor = cursor.next
+
+    def enable_stats(self) -> None:
+        """
+        Start recording instrumentation (discarding anything recorded before):
+        histograms of the nodes visited by each lookup, insert and delete,
+        the number and total duration of rehashes, and the number of
+        lookups that passed the membership filter but missed.
+        """
+        self._stats = {
+            "lookup_probes": Counter(),
+            "insert_probes": Counter(),
+            "delete_probes": Counter(),
+            "rehashes": 0,
+            "rehash_seconds": 0.0,
+            "filter_false_positives": 0,
+        }
+
+    def disable_stats(self) -> None:
+        """Stop recording instrumentation and discard anything recorded."""
+        self._stats = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the recorded instrumentation as a plain dict, with histograms
+        as dicts mapping a value to the number of times it was recorded.
+        """
+        if self._stats is None:
+            raise RuntimeError("Instrumentation is not enabled")
+        return {
+            name: dict(value) if isinstance(value, Counter) else value
+            for name, value in self._stats.items()
+        }
+
     def _rehash_needed(self) -> None:
         """Check if the load factor of the hash table is above 0.75."""
         if self._load / len(self._array) > 0.75:
@@ -135,11 +379,31 @@ class HashTable:
 
     def _rehash(self) -> None:
         """Double the size of the hash table array to reduce the load factor."""
-        old_array = deepcopy(self._array)
-        self._array = [Node() for _ in range(2 * len(self._array))]
-        self._load = 0
+        # Suspend instrumentation and the filter so re-inserts are neither
+        # recorded as inserts nor added to the filter a second time.
+        stats, self._stats = self._stats, None
+        key_filter, self._filter = self._filter, None
+        if stats is not None:
+            start = perf_counter()
 
-        for cursor in old_array:
-            while cursor and cursor.key:
-                self[cursor.key] = cursor.data
-                cursor = cursor.next
+        try:
+            old_array = deepcopy(self._array)
+            self._array = [Node() for _ in range(2 * len(self._array))]
+            self._load = 0
+
+            for cursor in old_array:
+                while cursor and cursor.key:
+                    self[cursor.key] = cursor.data
+                    cursor = cursor.next
+
+            # Only rebuild the filter once every entry has been re-inserted,
+            # so a failed rehash cannot leave it missing stored keys.
+            if key_filter is not None:
+                self._filter = key_filter
+                self._rebuild_filter()
+            if stats is not None:
+                stats["rehashes"] += 1
+                stats["rehash_seconds"] += perf_counter() - start
+        finally:
+            self._stats = stats
+            self._filter = key_filter
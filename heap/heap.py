@@ -1,9 +1,52 @@
+import gc
+import pickle
+import struct
+from typing import Any
+from typing import BinaryIO
+from typing import Dict
+from collections import Counter
+from functools import partial
+from itertools import chain
+from itertools import islice
+from sys import getsizeof
+from types import BuiltinFunctionType
+from types import FunctionType
+from types import ModuleType
+
+
+_SHARED = (type, ModuleType, FunctionType, BuiltinFunctionType)
+
+
+def _deep_sizeof(root: Any) -> int:
+    """
+    Return the number of bytes used by an object and every object it
+    references, counting each object once. Classes, modules and functions
+    are shared with the rest of the program, so they are not counted.
+
+    Arguments:
+        root: the object to measure.
+    """
+    seen = set()
+    objects = [root]
+    total = 0
+    # Walk the references iteratively to avoid recursion limits.
+    while objects:
+        obj = objects.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED):
+            continue
+        seen.add(id(obj))
+        total += getsizeof(obj)
+        objects.extend(gc.get_referents(obj))
+    return total
+
+
 class Heap:
     """
     An implementation of an array-based min heap.
 
     Attributes:
         _data: the data stored in the heap.
+        _stats: recorded instrumentation, or None if it is disabled.
 
     Methods:
         __init__
@@ -12,6 +55,12 @@ class Heap:
         add
         peek
         poll
+        memory_footprint
+        dump
+        load
+        enable_stats
+        disable_stats
+        stats
         _parent_index
         _left_child_index
         _right_child_index
@@ -29,6 +78,7 @@ class Heap:
     def __init__(self) -> None:
         """Initialise an empty heap."""
         self._data = []
+        self._stats = None
 
     def __len__(self) -> int:
         """Calculate the number of elements in the heap."""
@@ -69,6 +119,66 @@ class Heap:
         else:
             raise IndexError("Heap is empty")
 
+    def memory_footprint(self) -> int:
+        """
+        Return the number of bytes used by the heap, its array and the values
+        stored in it, following references from the values.
+        """
+        return _deep_sizeof(self)
+
+    def dump(self, file: BinaryIO, chunk_size: int = 65536) -> None:
+        """
+        Write the heap to a binary file object: a header holding the
+        number of items, followed by the items (in array order) as pickled
+        lists of at most chunk_size items.
+
+        Arguments:
+            file: the binary file object to write to.
+            chunk_size: the maximum number of items per pickled list.
+        """
+        file.write(struct.pack("<4sQ", b"HEAP", len(self._data)))
+        items = iter(self._data)
+        for chunk in iter(lambda: list(islice(items, chunk_size)), []):
+            pickle.dump(chunk, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, file: BinaryIO) -> "Heap":
+        """
+        Construct a heap from a trusted binary file object written by dump.
+        The items are already in heap order, so no sifting is done.
+
+        Arguments:
+            file: the binary file object to read from.
+        """
+        magic, count = struct.unpack("<4sQ", file.read(12))
+        if magic != b"HEAP":
+            raise ValueError("Not a heap dump")
+        heap = cls()
+        chunks = iter(partial(pickle.load, file), None)
+        items = islice(chain.from_iterable(chunks), count)
+        heap._data = list(items)
+        return heap
+
+    def enable_stats(self) -> None:
+        """
+        Start recording instrumentation (discarding anything recorded before):
+        histograms of the number of swaps made by each sift up and sift down.
+        """
+        self._stats = {"sift_up_steps": Counter(), "sift_down_steps": Counter()}
+
+    def disable_stats(self) -> None:
+        """Stop recording instrumentation and discard anything recorded."""
+        self._stats = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the recorded instrumentation as a plain dict, with histograms
+        as dicts mapping a step count to the number of times it was recorded.
+        """
+        if self._stats is None:
+            raise RuntimeError("Instrumentation is not enabled")
+        return {name: dict(value) for name, value in self._stats.items()}
+
     def _parent_index(self, index: int) -> int:
         """Return the index of the parent of a value in the heap."""
         return int((index - 1) / 2)
@@ -169,6 +279,10 @@ class Heap:
             else:
                 self._swap(index, child_index)
             index = child_index
+        if self._stats is not None:
+            # Each swap moves the value down one level, so the number of
+            # swaps is the depth at which it came to rest.
+            self._stats["sift_down_steps"][(index + 1).bit_length() - 1] += 1
 
     def _heap_up(self) -> None:
         """
@@ -182,3 +296,7 @@ class Heap:
                 index = self._parent_index(index)
             else:
                 break
+        if self._stats is not None:
+            # Each swap moves the value up one level of the tree.
+            steps = len(self).bit_length() - (index + 1).bit_length()
+            self._stats["sift_up_steps"][steps] += 1
@@ -1,7 +1,46 @@
 from __future__ import annotations
+import gc
+import pickle
+import struct
 from typing import Any
+from typing import BinaryIO
+from typing import Dict
 from typing import Optional
 from typing import Generator
+from collections import Counter
+from functools import partial
+from itertools import chain
+from itertools import islice
+from sys import getsizeof
+from types import BuiltinFunctionType
+from types import FunctionType
+from types import ModuleType
+
+
+_SHARED = (type, ModuleType, FunctionType, BuiltinFunctionType)
+
+
+def _deep_sizeof(root: Any) -> int:
+    """
+    Return the number of bytes used by an object and every object it
+    references, counting each object once. Classes, modules and functions
+    are shared with the rest of the program, so they are not counted.
+
+    Arguments:
+        root: the object to measure.
+    """
+    seen = set()
+    objects = [root]
+    total = 0
+    # Walk the references iteratively to avoid recursion limits.
+    while objects:
+        obj = objects.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED):
+            continue
+        seen.add(id(obj))
+        total += getsizeof(obj)
+        objects.extend(gc.get_referents(obj))
+    return total
 
 
 class Node:
@@ -17,6 +56,8 @@ class Node:
         __repr__
     """
 
+    __slots__ = ("data", "next")
+
     def __init__(self, data: Any, next: Optional[Node] = None) -> Node:
         """Initialise a node with the supplied data and next pointer."""
         self.data = data
@@ -41,11 +82,13 @@ class LinkedList:
 
     Attributes:
         head: the first node in the list.
+        _stats: recorded instrumentation, or None if it is disabled.
 
     Methods:
         __init__
         __repr__
         __iter__
+        _iter_recorded
         __getitem__
         __setitem__
         __len__
@@ -54,11 +97,18 @@ class LinkedList:
         remove
         append
         prepend
+        memory_footprint
+        dump
+        load
+        enable_stats
+        disable_stats
+        stats
     """
 
     def __init__(self) -> None:
         """Initialise an empty linked list object."""
         self.head = None
+        self._stats = None
 
     def __repr__(self) -> str:
         """
@@ -69,10 +119,31 @@ class LinkedList:
 
     def __iter__(self) -> Generator[Node, None, None]:
         """Return a generator for the linked list."""
-        cursor = self.head
-        while cursor:
-            yield cursor
-            cursor = cursor.next
+        if self._stats is None:
+            cursor = self.head
+            while cursor:
+                yield cursor
+                cursor = cursor.next
+        else:
+            yield from self._iter_recorded(self._stats["traversal_lengths"])
+
+    def _iter_recorded(self, lengths: Counter) -> Generator[Node, None, None]:
+        """
+        Return a generator for the linked list that records the number of
+        nodes yielded when it is exhausted or closed.
+
+        Arguments:
+            lengths: the histogram to record the traversal length in.
+        """
+        length = 0
+        try:
+            cursor = self.head
+            while cursor:
+                length += 1
+                yield cursor
+                cursor = cursor.next
+        finally:
+            lengths[length] += 1
 
     def __getitem__(self, key: int) -> Node:
         """
@@ -172,3 +243,70 @@ class LinkedList:
             data: the data the new node will contain.
         """
         self.head = Node(data, self.head)
+
+    def memory_footprint(self) -> int:
+        """
+        Return the number of bytes used by the linked list, its nodes and the
+        data stored in them, following references from the data.
+        """
+        return _deep_sizeof(self)
+
+    def dump(self, file: BinaryIO, chunk_size: int = 65536) -> None:
+        """
+        Write the linked list to a binary file object: a header holding the
+        number of items, followed by the items (head to foot) as pickled
+        lists of at most chunk_size items.
+
+        Arguments:
+            file: the binary file object to write to.
+            chunk_size: the maximum number of items per pickled list.
+        """
+        file.write(struct.pack("<4sQ", b"LLST", len(self)))
+        items = iter((node.data for node in self))
+        for chunk in iter(lambda: list(islice(items, chunk_size)), []):
+            pickle.dump(chunk, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, file: BinaryIO) -> LinkedList:
+        """
+        Construct a linked list from a trusted binary file object written by
+        dump. Nodes are linked in a single pass.
+
+        Arguments:
+            file: the binary file object to read from.
+        """
+        magic, count = struct.unpack("<4sQ", file.read(12))
+        if magic != b"LLST":
+            raise ValueError("Not a linked list dump")
+        linked_list = cls()
+        tail = None
+        chunks = iter(partial(pickle.load, file), None)
+        items = islice(chain.from_iterable(chunks), count)
+        for data in items:
+            node = Node(data)
+            if tail:
+                tail.next = node
+            else:
+                linked_list.head = node
+            tail = node
+        return linked_list
+
+    def enable_stats(self) -> None:
+        """
+        Start recording instrumentation (discarding anything recorded before):
+        a histogram of the number of nodes visited by each traversal.
+        """
+        self._stats = {"traversal_lengths": Counter()}
+
+    def disable_stats(self) -> None:
+        """Stop recording instrumentation and discard anything recorded."""
+        self._stats = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the recorded instrumentation as a plain dict, with histograms
+        as dicts mapping a length to the number of times it was recorded.
+        """
+        if self._stats is None:
+            raise RuntimeError("Instrumentation is not enabled")
+        return {name: dict(value) for name, value in self._stats.items()}
@@ -1,7 +1,44 @@
 from __future__ import annotations
+import gc
+import pickle
+import struct
 from typing import Any
+from typing import BinaryIO
 from typing import Optional
 from typing import Generator
+from functools import partial
+from itertools import chain
+from itertools import islice
+from sys import getsizeof
+from types import BuiltinFunctionType
+from types import FunctionType
+from types import ModuleType
+
+
+_SHARED = (type, ModuleType, FunctionType, BuiltinFunctionType)
+
+
+def _deep_sizeof(root: Any) -> int:
+    """
+    Return the number of bytes used by an object and every object it
+    references, counting each object once. Classes, modules and functions
+    are shared with the rest of the program, so they are not counted.
+
+    Arguments:
+        root: the object to measure.
+    """
+    seen = set()
+    objects = [root]
+    total = 0
+    # Walk the references iteratively to avoid recursion limits.
+    while objects:
+        obj = objects.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED):
+            continue
+        seen.add(id(obj))
+        total += getsizeof(obj)
+        objects.extend(gc.get_referents(obj))
+    return total
 
 
 class Queue:
@@ -19,6 +56,9 @@ class Queue:
         enqueue
         dequeue
         front
+        memory_footprint
+        dump
+        load
     """
 
     def __init__(self) -> None:
@@ -69,3 +109,43 @@ class Queue:
         """Return data at the front of the queue (head has index 0)."""
         if self._items:
             return self._items[0]
+
+    def memory_footprint(self) -> int:
+        """
+        Return the number of bytes used by the queue, its array and the items
+        stored in it, following references from the items.
+        """
+        return _deep_sizeof(self)
+
+    def dump(self, file: BinaryIO, chunk_size: int = 65536) -> None:
+        """
+        Write the queue to a binary file object: a header holding the
+        number of items, followed by the items (front to back) as pickled
+        lists of at most chunk_size items.
+
+        Arguments:
+            file: the binary file object to write to.
+            chunk_size: the maximum number of items per pickled list.
+        """
+        file.write(struct.pack("<4sQ", b"QUEU", len(self._items)))
+        items = iter(self._items)
+        for chunk in iter(lambda: list(islice(items, chunk_size)), []):
+            pickle.dump(chunk, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, file: BinaryIO) -> Queue:
+        """
+        Construct a queue from a trusted binary file object written by dump.
+        The items are read straight into the array.
+
+        Arguments:
+            file: the binary file object to read from.
+        """
+        magic, count = struct.unpack("<4sQ", file.read(12))
+        if magic != b"QUEU":
+            raise ValueError("Not a queue dump")
+        queue = cls()
+        chunks = iter(partial(pickle.load, file), None)
+        items = islice(chain.from_iterable(chunks), count)
+        queue._items = list(items)
+        return queue
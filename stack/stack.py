@@ -1,12 +1,59 @@
+from __future__ import annotations
+import gc
+import pickle
+import struct
 from typing import Any
+from typing import BinaryIO
+from typing import Callable
+from typing import Optional
+from functools import partial
+from itertools import chain
+from itertools import islice
+from sys import getsizeof
+from types import BuiltinFunctionType
+from types import FunctionType
+from types import ModuleType
+
+
+_SHARED = (type, ModuleType, FunctionType, BuiltinFunctionType)
+
+
+def _deep_sizeof(root: Any) -> int:
+    """
+    Return the number of bytes used by an object and every object it
+    references, counting each object once. Classes, modules and functions
+    are shared with the rest of the program, so they are not counted.
+
+    Arguments:
+        root: the object to measure.
+    """
+    seen = set()
+    objects = [root]
+    total = 0
+    # Walk the references iteratively to avoid recursion limits.
+    while objects:
+        obj = objects.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED):
+            continue
+        seen.add(id(obj))
+        total += getsizeof(obj)
+        objects.extend(gc.get_referents(obj))
+    return total
 
 
 class Stack:
     """
     Implementation of an array-based stack.
 
+    If an aggregate function is supplied, the stack also maintains the
+    running aggregate of its items (bottom to top), so that e.g. the
+    minimum, maximum or sum of the stack is available in O(1) time. The
+    function must be associative (min, max, operator.add, ...).
+
     Attributes:
         _items: the data stored in the stack.
+        _function: the associative function used to aggregate items.
+        _aggregates: the running aggregate of the items up to each index.
 
     Methods:
         __init__
@@ -14,11 +61,24 @@ class Stack:
         __len__
         push
         pop
+        top
+        aggregate
+        memory_footprint
+        dump
+        load
     """
 
-    def __init__(self) -> None:
-        """Initialise an empty stack."""
+    def __init__(self, function: Optional[Callable[[Any, Any], Any]] = None) -> None:
+        """
+        Initialise an empty stack.
+
+        Arguments:
+            function: an associative function of two items used to
+                maintain a running aggregate (optional).
+        """
         self._items = []
+        self._function = function
+        self._aggregates = []
 
     def __repr__(self) -> str:
         """Return a string representation of the stack."""
@@ -36,12 +96,214 @@ class Stack:
         Arguments:
             item: the data to add to the stack.
         """
+        if self._function is not None:
+            if self._aggregates:
+                self._aggregates.append(self._function(self._aggregates[-1], item))
+            else:
+                self._aggregates.append(item)
         self._items.append(item)
 
     def pop(self) -> Any:
         """Remove the top-most item (at end of array) from the stack."""
-        return self._items.pop()
+        item = self._items.pop()
+        if self._function is not None:
+            self._aggregates.pop()
+        return item
 
     def top(self) -> Any:
         """Return the value at the top of the stack (end of array)."""
         return self._items[-1]
+
+    def aggregate(self) -> Any:
+        """Return the aggregate of all items in the stack."""
+        if self._function is None:
+            raise TypeError("Stack has no aggregate function")
+        if self._aggregates:
+            return self._aggregates[-1]
+        else:
+            raise IndexError("Stack is empty")
+
+    def memory_footprint(self) -> int:
+        """
+        Return the number of bytes used by the stack, its items and running
+        aggregates, following references from the items.
+        """
+        return _deep_sizeof(self)
+
+    def dump(self, file: BinaryIO, chunk_size: int = 65536) -> None:
+        """
+        Write the stack to a binary file object: a header holding the
+        number of items, followed by the items (bottom to top) as pickled
+        lists of at most chunk_size items. The aggregate function is
+        not written.
+
+        Arguments:
+            file: the binary file object to write to.
+            chunk_size: the maximum number of items per pickled list.
+        """
+        file.write(struct.pack("<4sQ", b"STCK", len(self._items)))
+        items = iter(self._items)
+        for chunk in iter(lambda: list(islice(items, chunk_size)), []):
+            pickle.dump(chunk, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(
+        cls, file: BinaryIO, function: Optional[Callable[[Any, Any], Any]] = None
+    ) -> Stack:
+        """
+        Construct a stack from a trusted binary file object written by dump.
+        Running aggregates are recomputed in a single pass.
+
+        Arguments:
+            file: the binary file object to read from.
+            function: an associative function of two items used to
+                maintain a running aggregate (optional).
+        """
+        magic, count = struct.unpack("<4sQ", file.read(12))
+        if magic != b"STCK":
+            raise ValueError("Not a stack dump")
+        stack = cls(function)
+        chunks = iter(partial(pickle.load, file), None)
+        items = islice(chain.from_iterable(chunks), count)
+        if function is not None:
+            for item in items:
+                stack.push(item)
+        else:
+            stack._items = list(items)
+        return stack
+
+
+class AggregateQueue:
+    """
+    An implementation of a queue built from two aggregate stacks, which
+    maintains the aggregate of its items (front to back) in amortised
+    O(1) time. Suitable for sliding-window minimum, maximum, sum, etc.
+
+    Items are enqueued onto _back. When the front of the queue is needed
+    and _front is empty, all items are moved from _back to _front,
+    reversing their order so the oldest item is on top.
+
+    Attributes:
+        _function: the associative function used to aggregate items.
+        _front: a stack holding the oldest items (oldest on top).
+        _back: a stack holding the newest items (newest on top).
+
+    Methods:
+        __init__
+        __repr__
+        __len__
+        enqueue
+        dequeue
+        front
+        aggregate
+        memory_footprint
+        dump
+        load
+        _transfer
+    """
+
+    def __init__(self, function: Callable[[Any, Any], Any]) -> None:
+        """
+        Initialise an empty queue.
+
+        Arguments:
+            function: an associative function of two items used to
+                maintain the aggregate of the queue.
+        """
+        self._function = function
+        # _front holds items newest-to-oldest from bottom to top, so its
+        # arguments are swapped to keep the aggregate in queue order.
+        self._front = Stack(lambda left, right: function(right, left))
+        self._back = Stack(function)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the queue object."""
+        items = self._front._items[::-1] + self._back._items
+        items_repr = ", ".join(repr(item) for item in items)
+        return f"{self.__class__.__name__}({items_repr})"
+
+    def __len__(self) -> int:
+        """Calculate the length of the queue."""
+        return len(self._front) + len(self._back)
+
+    def enqueue(self, data: Any) -> None:
+        """
+        Enqueue data at the back of the queue.
+
+        Arguments:
+            data: the data to store in the queue.
+        """
+        self._back.push(data)
+
+    def dequeue(self) -> Any:
+        """Dequeue data from the front of the queue and return it."""
+        if self:
+            self._transfer()
+            return self._front.pop()
+
+    def front(self) -> Optional[Any]:
+        """Return data at the front of the queue."""
+        if self:
+            self._transfer()
+            return self._front.top()
+
+    def aggregate(self) -> Optional[Any]:
+        """Return the aggregate of all items in the queue (front to back)."""
+        if self._front and self._back:
+            return self._function(self._front.aggregate(), self._back.aggregate())
+        elif self._front:
+            return self._front.aggregate()
+        elif self._back:
+            return self._back.aggregate()
+
+    def memory_footprint(self) -> int:
+        """
+        Return the number of bytes used by the queue, both of its stacks and
+        the items stored in them.
+        """
+        return _deep_sizeof(self)
+
+    def dump(self, file: BinaryIO, chunk_size: int = 65536) -> None:
+        """
+        Write the queue to a binary file object: a header holding the
+        number of items, followed by the items (front to back) as pickled
+        lists of at most chunk_size items. The aggregate function is
+        not written.
+
+        Arguments:
+            file: the binary file object to write to.
+            chunk_size: the maximum number of items per pickled list.
+        """
+        file.write(struct.pack("<4sQ", b"AGGQ", len(self)))
+        items = chain(reversed(self._front._items), self._back._items)
+        for chunk in iter(lambda: list(islice(items, chunk_size)), []):
+            pickle.dump(chunk, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(
+        cls, file: BinaryIO, function: Callable[[Any, Any], Any]
+    ) -> AggregateQueue:
+        """
+        Construct a queue from a trusted binary file object written by dump.
+        Aggregates are recomputed in a single pass.
+
+        Arguments:
+            file: the binary file object to read from.
+            function: an associative function of two items used to
+                maintain the aggregate of the queue.
+        """
+        magic, count = struct.unpack("<4sQ", file.read(12))
+        if magic != b"AGGQ":
+            raise ValueError("Not an aggregate queue dump")
+        queue = cls(function)
+        chunks = iter(partial(pickle.load, file), None)
+        items = islice(chain.from_iterable(chunks), count)
+        for item in items:
+            queue.enqueue(item)
+        return queue
+
+    def _transfer(self) -> None:
+        """Move all items from _back to _front if _front is empty."""
+        if not self._front:
+            while self._back:
+                self._front.push(self._back.pop())